@@ -1,10 +1,13 @@
 import { NextRequest, NextResponse } from "next/server";
+import crypto from "crypto";
+import { createClient } from "@/lib/supabase/server";
+import { getLLMSettings } from "@/lib/llm/settings";
 import { validateCitations } from "@/lib/citations/validator";
 import {
   buildPageContext,
   CITATION_EXTRACTION_SYSTEM_PROMPT,
 } from "@/lib/citations/prompts";
-import type { CitedResponse } from "@/types/citation";
+import type { Citation, CitedResponse } from "@/types/citation";
 
 interface CitationExtractionRequest {
   answerText: string;
@@ -15,6 +18,47 @@ interface CitationExtractionRequest {
   };
 }
 
+const CITATION_MODEL = "google/gemma-3n-e4b-it:free";
+
+/**
+ * In-memory exact-match cache of parsed extraction results, keyed by
+ * hash(provider|model|context|answer). Only successfully parsed LLM output is
+ * stored; validation against the request pages still runs on every call.
+ * Map iteration order is insertion order, so the first key is the LRU entry.
+ */
+const CITATION_CACHE_MAX_ENTRIES = 200;
+const citationCache = new Map<string, Citation[]>();
+
+function getCitationCacheKey(
+  provider: string,
+  model: string,
+  context: string,
+  answerText: string,
+): string {
+  return crypto
+    .createHash("sha256")
+    .update(`${provider}|${model}|${context}|${answerText}`)
+    .digest("hex");
+}
+
+function getCachedCitations(key: string): Citation[] | undefined {
+  const cached = citationCache.get(key);
+  if (cached !== undefined) {
+    // Refresh recency
+    citationCache.delete(key);
+    citationCache.set(key, cached);
+  }
+  return cached;
+}
+
+function setCachedCitations(key: string, citations: Citation[]): void {
+  citationCache.set(key, citations);
+  if (citationCache.size > CITATION_CACHE_MAX_ENTRIES) {
+    const oldestKey = citationCache.keys().next().value;
+    if (oldestKey !== undefined) citationCache.delete(oldestKey);
+  }
+}
+
 /**
  * POST /api/chat/citations
  * Extract citations for a given answer text.
@@ -30,15 +74,31 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    // Build context from pages
+    // Build context from pages (truncated to MAX_CONTEXT_LENGTH)
     const context = buildPageContext(body.pages, body.highlightContext);
 
-    // Limit context size (rough estimate: 4 chars per token, max ~8000 tokens for context)
-    const maxContextLength = 32000;
-    const truncatedContext =
-      context.length > maxContextLength
-        ? context.slice(0, maxContextLength) + "\n[...context truncated...]"
-        : context;
+    // Key on the model /api/llm will actually use: OpenRouter honours the
+    // requested model, LM Studio serves whatever is loaded at its URL
+    const supabase = await createClient();
+    const settings = await getLLMSettings(supabase);
+    const provider = settings?.llm_provider || "openrouter";
+    const resolvedModel =
+      provider === "lmstudio"
+        ? settings?.lmstudio_url || "http://localhost:1234/v1"
+        : CITATION_MODEL;
+    const cacheKey = getCitationCacheKey(
+      provider,
+      resolvedModel,
+      context,
+      body.answerText,
+    );
+
+    const cachedCitations = getCachedCitations(cacheKey);
+    if (cachedCitations !== undefined) {
+      return NextResponse.json({
+        citations: validateCitations(cachedCitations, body.pages),
+      });
+    }
 
     const baseUrl =
       process.env.NEXT_PUBLIC_APP_URL || new URL(request.url).origin;
@@ -46,12 +106,12 @@ export async function POST(request: NextRequest) {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({
-        model: "google/gemma-3n-e4b-it:free",
+        model: CITATION_MODEL,
         messages: [
           { role: "system", content: CITATION_EXTRACTION_SYSTEM_PROMPT },
           {
             role: "user",
-            content: `CONTEXTE DU PAPER:\n${truncatedContext}\n\nREPONSE A CITER:\n${body.answerText}`,
+            content: `CONTEXTE DU PAPER:\n${context}\n\nREPONSE A CITER:\n${body.answerText}`,
           },
         ],
         temperature: 0.2,
@@ -69,17 +129,24 @@ export async function POST(request: NextRequest) {
     const rawContent = llmData.choices?.[0]?.message?.content || "";
 
     let parsedResponse: CitedResponse = { answer: "", citations: [] };
+    let parsed = false;
     try {
       parsedResponse = JSON.parse(rawContent);
+      parsed = true;
     } catch {
       try {
         const extractedJson = extractJsonFromMarkdown(rawContent);
         parsedResponse = JSON.parse(extractedJson);
+        parsed = true;
       } catch (parseError) {
         console.warn("Citation extraction parse failed:", parseError);
       }
     }
 
+    if (parsed && Array.isArray(parsedResponse.citations)) {
+      setCachedCitations(cacheKey, parsedResponse.citations);
+    }
+
     const validatedCitations = validateCitations(
       parsedResponse.citations || [],
       body.pages,
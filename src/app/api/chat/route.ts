@@ -1,5 +1,7 @@
 import { NextRequest, NextResponse } from "next/server";
 import { createClient } from "@/lib/supabase/server";
+import { getLLMSettings } from "@/lib/llm/settings";
+import { readCompletionDeltas } from "@/lib/llm/stream";
 import { buildPageContext, CHAT_SYSTEM_PROMPT } from "@/lib/citations/prompts";
 
 interface ChatRequest {
@@ -31,16 +33,9 @@ export async function POST(request: NextRequest) {
     const body: ChatRequest = await request.json();
     const supabase = await createClient();
 
-    // Build context from pages
+    // Build context from pages (truncated to MAX_CONTEXT_LENGTH)
     const context = buildPageContext(body.pages, body.highlightContext);
 
-    // Limit context size (rough estimate: 4 chars per token, max ~8000 tokens for context)
-    const maxContextLength = 32000;
-    const truncatedContext =
-      context.length > maxContextLength
-        ? context.slice(0, maxContextLength) + "\n[...context truncated...]"
-        : context;
-
     // Get conversation history if exists
     let messageHistory: Array<{ role: string; content: string }> = [];
 
@@ -103,10 +98,7 @@ export async function POST(request: NextRequest) {
       ];
     }
 
-    const { data: settings } = await supabase
-      .from("settings")
-      .select("llm_provider, lmstudio_url, openrouter_model")
-      .single();
+    const settings = await getLLMSettings(supabase);
 
     const provider = settings?.llm_provider || "openrouter";
 
@@ -126,7 +118,7 @@ export async function POST(request: NextRequest) {
           { role: "system", content: CHAT_SYSTEM_PROMPT },
           {
             role: "user",
-            content: `CONTEXTE DU PAPER:\n${truncatedContext}`,
+            content: `CONTEXTE DU PAPER:\n${context}`,
           },
           ...messageHistory,
           { role: "user", content: userMessageContent },
@@ -166,7 +158,7 @@ export async function POST(request: NextRequest) {
           { role: "system", content: CHAT_SYSTEM_PROMPT },
           {
             role: "user",
-            content: `CONTEXTE DU PAPER:\n${truncatedContext}`,
+            content: `CONTEXTE DU PAPER:\n${context}`,
           },
           ...messageHistory,
           { role: "user", content: userMessageContent },
@@ -193,58 +185,23 @@ export async function POST(request: NextRequest) {
     }
 
     const encoder = new TextEncoder();
-    const decoder = new TextDecoder();
     let fullText = "";
 
     const stream = new ReadableStream({
       async start(controller) {
-        const reader = llmResponse.body!.getReader();
-        let buffer = "";
-        let isClosed = false;
-
-        const closeStream = () => {
-          if (!isClosed) {
-            controller.close();
-            isClosed = true;
-          }
-        };
-
         try {
-          while (true) {
-            const { value, done } = await reader.read();
-            if (done) break;
-
-            buffer += decoder.decode(value, { stream: true });
-            const lines = buffer.split("\n");
-            buffer = lines.pop() ?? "";
-
-            for (const line of lines) {
-              const trimmed = line.trim();
-              if (!trimmed.startsWith("data:")) continue;
-
-              const data = trimmed.replace(/^data:\s*/, "");
-              if (data === "[DONE]") {
-                closeStream();
-                break;
-              }
-
-              try {
-                const parsed = JSON.parse(data);
-                const delta =
-                  parsed.choices?.[0]?.delta?.content ??
-                  parsed.choices?.[0]?.message?.content ??
-                  "";
-                if (delta) {
-                  fullText += delta;
-                  controller.enqueue(encoder.encode(delta));
-                }
-              } catch (parseError) {
-                console.error("Streaming parse error:", parseError);
-              }
-            }
-          }
+          // Resolves on [DONE] or end of body, so nothing is enqueued after
+          // the stream is closed below
+          await readCompletionDeltas(llmResponse.body!, (delta) => {
+            fullText += delta;
+            controller.enqueue(encoder.encode(delta));
+          });
         } finally {
-          closeStream();
+          try {
+            controller.close();
+          } catch {
+            // The client cancelled the response, so the stream is already closed
+          }
           if (conversationId) {
             await supabase.from("messages").insert({
               conversation_id: conversationId,
@@ -289,8 +246,3 @@ function extractAnswerFromContent(content: string): string {
     return content;
   }
 }
-
-/**
- * Extract JSON from markdown code blocks or return the content as-is
- * Handles responses like: ```json\n{...}\n``` or ```\n{...}\n```
- */
@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from "next/server";
 import { createClient } from "@/lib/supabase/server";
+import { getLLMSettings } from "@/lib/llm/settings";
 
 interface LLMMessage {
   role: "user" | "assistant" | "system";
@@ -23,11 +24,8 @@ export async function POST(request: NextRequest) {
     const body: LLMRequest = await request.json();
     const supabase = await createClient();
 
-    // Get settings from database
-    const { data: settings } = await supabase
-      .from("settings")
-      .select("llm_provider, lmstudio_url, openrouter_model")
-      .single();
+    // Get settings (cached in memory for a short TTL)
+    const settings = await getLLMSettings(supabase);
 
     const provider = settings?.llm_provider || "openrouter";
 
@@ -98,8 +96,12 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    const data = await response.json();
-    return NextResponse.json(data);
+    // Pass the provider body through untouched: no JSON.parse/stringify
+    // round trip for completions that are forwarded as-is
+    return new NextResponse(response.body, {
+      status: 200,
+      headers: { "Content-Type": "application/json; charset=utf-8" },
+    });
   } catch (error) {
     console.error("LLM error:", error);
     return NextResponse.json(
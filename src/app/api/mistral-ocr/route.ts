@@ -29,7 +29,9 @@ export async function GET() {
  *  documentUrl: string,
  *  includeImages?: boolean,
  *  pages?: string,
- *  outputFormat?: "markdown" | "html"
+ *  outputFormat?: "markdown" | "html",
+ *  dedupeImages?: boolean,
+ *  imageMinSize?: number
  * }
  */
 export async function POST(request: NextRequest) {
@@ -51,6 +53,8 @@ export async function POST(request: NextRequest) {
       includeImages = true,
       pages,
       outputFormat = "html",
+      dedupeImages = false,
+      imageMinSize,
     } = body;
     const normalizedOutputFormat =
       outputFormat === "markdown" ? "markdown" : "html";
@@ -68,6 +72,8 @@ export async function POST(request: NextRequest) {
       tableFormat: normalizedOutputFormat,
       outputFormat: normalizedOutputFormat,
       pages,
+      dedupeImages,
+      imageMinSize,
     });
 
     return NextResponse.json({
@@ -1,21 +1,57 @@
-import { NextRequest, NextResponse } from "next/server";
+import { NextRequest, NextResponse, after } from "next/server";
 import { createClient } from "@/lib/supabase/server";
-import { extractAllPages, chunkPageContent } from "@/lib/pdf/parser";
+import {
+  extractDocument,
+  readDocumentTitle,
+  chunkPageContent,
+} from "@/lib/pdf/parser";
 import {
   MAX_PDF_SIZE_BYTES,
   MAX_PDF_SIZE_LABEL,
 } from "@/lib/pdf/constants";
+import { mapWithConcurrency } from "@/lib/utils";
+import type { PageData } from "@/types/pdf";
 import crypto from "crypto";
 
 export const runtime = "nodejs";
 export const maxDuration = 300;
 
+/**
+ * A paper still "processing" after this long lost its background task
+ * (timeout or recycled instance) and is treated as failed
+ */
+const STALE_PROCESSING_MS = (maxDuration + 60) * 1000;
+
+/** Upper bound for the multipart body: the PDF plus form-data overhead */
+const MAX_INGEST_BODY_BYTES = MAX_PDF_SIZE_BYTES + 1024 * 1024;
+
+/** PDF readers accept the %PDF- header anywhere in the first 1024 bytes */
+const PDF_HEADER = "%PDF-";
+const PDF_HEADER_SEARCH_BYTES = 1024;
+
+/** Max number of page rows (with their chunks) written concurrently */
+const PAGE_INSERT_CONCURRENCY = 4;
+
+type SupabaseServerClient = Awaited<ReturnType<typeof createClient>>;
+
 /**
  * POST /api/papers/ingest
- * Upload and process a PDF file
+ * Upload a PDF file and schedule its processing
+ *
+ * Responds 202 once the paper record exists; page extraction runs after the
+ * response is sent. Poll GET /api/papers/ingest?paperId=... for completion.
  */
 export async function POST(request: NextRequest) {
   try {
+    // Reject oversized uploads before buffering the multipart body
+    const contentLength = Number(request.headers.get("content-length"));
+    if (contentLength > MAX_INGEST_BODY_BYTES) {
+      return NextResponse.json(
+        { error: `File too large. Max size is ${MAX_PDF_SIZE_LABEL}.` },
+        { status: 413 },
+      );
+    }
+
     const formData = await request.formData();
     const file = formData.get("file") as File | null;
     const arxivUrl = formData.get("arxivUrl") as string | null;
@@ -31,21 +67,25 @@ export async function POST(request: NextRequest) {
       );
     }
 
+    // The MIME type comes from the client; check the actual file header
+    if (!(await hasPdfHeader(file))) {
+      return NextResponse.json({ error: "Invalid PDF file" }, { status: 400 });
+    }
+
     const supabase = await createClient();
-    const buffer = await file.arrayBuffer();
 
     // Calculate file hash for deduplication
-    const fileHash = crypto
-      .createHash("sha256")
-      .update(Buffer.from(buffer))
-      .digest("hex");
+    const fileHash = await hashFileStream(file);
 
-    // Clean up any previous failed upload with same hash
+    // Clean up any previous failed (or abandoned) upload with same hash
+    const staleBefore = new Date(Date.now() - STALE_PROCESSING_MS).toISOString();
     const { data: failedPapers } = await supabase
       .from("papers")
       .select("id, storage_path")
       .eq("file_hash", fileHash)
-      .eq("status", "error");
+      .or(
+        `status.eq.error,and(status.eq.processing,created_at.lt."${staleBefore}")`,
+      );
 
     if (failedPapers && failedPapers.length > 0) {
       for (const failed of failedPapers) {
@@ -58,7 +98,7 @@ export async function POST(request: NextRequest) {
     const storagePath = `${fileHash}-${crypto.randomUUID()}.pdf`;
     const { error: uploadError } = await supabase.storage
       .from("papers")
-      .upload(storagePath, buffer, {
+      .upload(storagePath, file, {
         contentType: "application/pdf",
         upsert: false,
       });
@@ -102,26 +142,140 @@ export async function POST(request: NextRequest) {
       throw new Error("Failed to create paper record");
     }
 
+    // Extract pages once the response has been sent
+    after(() =>
+      processPaperPages(supabase, paper.id, fileHash, file, title),
+    );
+
+    return NextResponse.json(
+      {
+        paperId: paper.id,
+        status: "processing",
+      },
+      { status: 202 },
+    );
+  } catch (error) {
+    console.error("Ingestion error:", error);
+    return NextResponse.json(
+      {
+        error: error instanceof Error ? error.message : "Failed to process PDF",
+      },
+      { status: 500 },
+    );
+  }
+}
+
+/**
+ * GET /api/papers/ingest?paperId=...
+ * Report processing status for an uploaded paper (202 while processing)
+ */
+export async function GET(request: NextRequest) {
+  try {
+    const paperId = request.nextUrl.searchParams.get("paperId");
+
+    if (!paperId) {
+      return NextResponse.json(
+        { error: "paperId is required" },
+        { status: 400 },
+      );
+    }
+
+    const supabase = await createClient();
+    const { data: paper, error } = await supabase
+      .from("papers")
+      .select("id, status, page_count, processing_error, created_at")
+      .eq("id", paperId)
+      .maybeSingle();
+
+    if (error) {
+      console.error("Paper status error:", error);
+      return NextResponse.json(
+        { error: "Failed to fetch paper status" },
+        { status: 500 },
+      );
+    }
+
+    if (!paper) {
+      return NextResponse.json({ error: "Paper not found" }, { status: 404 });
+    }
+
+    // The background task can die without updating the row (timeout,
+    // recycled instance); report such papers as failed instead of pending
+    const isStale =
+      paper.status === "processing" &&
+      Date.now() - new Date(paper.created_at).getTime() > STALE_PROCESSING_MS;
+
+    if (isStale) {
+      return NextResponse.json({
+        paperId: paper.id,
+        status: "error",
+        pageCount: paper.page_count,
+        error: "PDF processing timed out",
+      });
+    }
+
+    return NextResponse.json(
+      {
+        paperId: paper.id,
+        status: paper.status,
+        pageCount: paper.page_count,
+        error: paper.processing_error,
+      },
+      { status: paper.status === "processing" ? 202 : 200 },
+    );
+  } catch (error) {
+    console.error("Paper status error:", error);
+    return NextResponse.json(
+      {
+        error:
+          error instanceof Error ? error.message : "Failed to fetch status",
+      },
+      { status: 500 },
+    );
+  }
+}
+
+/**
+ * Extract pages, store them with their chunks and set the final paper status.
+ * Runs after the ingest response; failures are recorded on the paper row.
+ */
+async function processPaperPages(
+  supabase: SupabaseServerClient,
+  paperId: string,
+  fileHash: string,
+  file: Blob,
+  filenameTitle: string,
+): Promise<void> {
+  try {
+    // Reuse pages already extracted from an identical file
+    let pages = await findExtractedPages(supabase, fileHash, paperId);
+    // Metadata title, if any, replaces the filename-based title
+    let metadataTitle: string | null = null;
+
     // Extract pages from PDF
-    let pages;
     try {
-      pages = await extractAllPages(buffer);
+      const pdfBuffer = await file.arrayBuffer();
+      if (pages) {
+        // Pages reused: still read the title so both paths name it the same
+        metadataTitle = await readDocumentTitle(pdfBuffer);
+      } else {
+        const extracted = await extractDocument(pdfBuffer);
+        pages = extracted.pages;
+        metadataTitle = extracted.title;
+      }
     } catch (extractError) {
       console.error("PDF extraction error:", extractError);
-      // Clean up: remove storage file and DB record on extraction failure
-      await supabase.storage.from("papers").remove([storagePath]);
-      await supabase.from("papers").delete().eq("id", paper.id);
       const extractMessage =
         extractError instanceof Error ? extractError.message : "Unknown error";
       throw new Error(`Failed to extract text from PDF: ${extractMessage}`);
     }
 
-    // Insert pages
-    for (const page of pages) {
+    // Insert pages, several in flight at once
+    await mapWithConcurrency(pages, PAGE_INSERT_CONCURRENCY, async (page) => {
       const { data: pageData, error: pageError } = await supabase
         .from("paper_pages")
         .insert({
-          paper_id: paper.id,
+          paper_id: paperId,
           page_number: page.pageNumber,
           text_content: page.textContent,
           text_items: page.textItems,
@@ -134,23 +288,29 @@ export async function POST(request: NextRequest) {
 
       if (pageError) {
         console.error("Page insert error:", pageError);
-        continue;
+        return;
       }
 
-      // Create chunks for this page
+      // Create chunks for this page in a single insert
       const chunks = chunkPageContent(page.textContent);
-      for (let i = 0; i < chunks.length; i++) {
-        await supabase.from("chunks").insert({
-          paper_id: paper.id,
+      if (chunks.length === 0) return;
+
+      const { error: chunksError } = await supabase.from("chunks").insert(
+        chunks.map((chunk, i) => ({
+          paper_id: paperId,
           page_id: pageData.id,
           page_number: page.pageNumber,
           chunk_index: i,
-          content: chunks[i].content,
-          start_offset: chunks[i].startOffset,
-          end_offset: chunks[i].endOffset,
-        });
+          content: chunk.content,
+          start_offset: chunk.startOffset,
+          end_offset: chunk.endOffset,
+        })),
+      );
+
+      if (chunksError) {
+        console.error("Chunk insert error:", chunksError);
       }
-    }
+    });
 
     // Determine final status
     const hasOcrNeeded = pages.some((p) => !p.hasText);
@@ -162,23 +322,90 @@ export async function POST(request: NextRequest) {
       .update({
         status: finalStatus,
         page_count: pages.length,
+        ...(metadataTitle &&
+        metadataTitle.toLowerCase() !== filenameTitle.toLowerCase()
+          ? { title: metadataTitle }
+          : {}),
       })
-      .eq("id", paper.id);
-
-    return NextResponse.json({
-      paperId: paper.id,
-      pageCount: pages.length,
-      status: finalStatus,
-    });
+      .eq("id", paperId);
   } catch (error) {
-    console.error("Ingestion error:", error);
-    return NextResponse.json(
-      {
-        error: error instanceof Error ? error.message : "Failed to process PDF",
-      },
-      { status: 500 },
-    );
+    console.error("Paper processing error:", error);
+    // Keep the record as "error" so the uploader can report it; the next
+    // upload of the same file cleans it up.
+    await supabase
+      .from("papers")
+      .update({
+        status: "error",
+        processing_error:
+          error instanceof Error ? error.message : "Failed to process PDF",
+      })
+      .eq("id", paperId);
+  }
+}
+
+/**
+ * Load the pages of an already processed paper with the same file hash.
+ * PDFs are immutable once uploaded, so identical bytes yield identical pages.
+ */
+async function findExtractedPages(
+  supabase: SupabaseServerClient,
+  fileHash: string,
+  excludePaperId: string,
+): Promise<PageData[] | null> {
+  const { data: source } = await supabase
+    .from("papers")
+    .select("id, page_count")
+    .eq("file_hash", fileHash)
+    .in("status", ["ready", "ocr_needed"])
+    .neq("id", excludePaperId)
+    .limit(1)
+    .maybeSingle();
+
+  if (!source) return null;
+
+  const { data: rows, error } = await supabase
+    .from("paper_pages")
+    .select("page_number, text_content, text_items, width, height, has_text")
+    .eq("paper_id", source.id)
+    .order("page_number", { ascending: true });
+
+  // Partial page sets (e.g. a failed page insert) are not worth reusing
+  if (error || !rows || rows.length !== source.page_count) return null;
+
+  return rows.map((row) => ({
+    pageNumber: row.page_number,
+    textContent: row.text_content,
+    textItems: row.text_items,
+    width: row.width,
+    height: row.height,
+    hasText: row.has_text,
+  }));
+}
+
+/**
+ * Check for the %PDF- header without reading past the first kilobyte
+ */
+async function hasPdfHeader(file: Blob): Promise<boolean> {
+  const head = await file.slice(0, PDF_HEADER_SEARCH_BYTES).arrayBuffer();
+  return Buffer.from(head).includes(PDF_HEADER);
+}
+
+/**
+ * SHA-256 of a file, fed chunk by chunk from its stream. request.formData()
+ * has already buffered the upload; this only avoids copying it into an
+ * extra ArrayBuffer before the storage upload.
+ */
+async function hashFileStream(file: Blob): Promise<string> {
+  const hash = crypto.createHash("sha256");
+  const reader = file.stream().getReader();
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    hash.update(value);
   }
+
+  return hash.digest("hex");
 }
 
 /**
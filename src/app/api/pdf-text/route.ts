@@ -1,16 +1,16 @@
 import { NextRequest, NextResponse } from "next/server";
-import { extractPageData } from "@/lib/pdf/parser";
-import * as pdfjsLib from "pdfjs-dist/legacy/build/pdf.mjs";
+import {
+  extractPages,
+  extractPageStats,
+  isPdfFetchError,
+  loadPdfDocument,
+  loadPdfDocumentFromUrl,
+} from "@/lib/pdf/parser";
 import type { PageData } from "@/types/pdf";
 
 export const runtime = "nodejs";
 export const maxDuration = 60;
 
-pdfjsLib.GlobalWorkerOptions.workerSrc = new URL(
-  "pdfjs-dist/legacy/build/pdf.worker.mjs",
-  import.meta.url,
-).toString();
-
 interface ExtractRequest {
   /** URL of the PDF to extract text from */
   pdfUrl: string;
@@ -53,45 +53,34 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    // Fetch the PDF
-    const response = await fetch(pdfUrl);
-    if (!response.ok) {
-      return NextResponse.json(
-        { error: `Failed to fetch PDF: ${response.statusText}` },
-        { status: 400 },
-      );
+    // Load the PDF document
+    const opened = await openRemotePdf(pdfUrl, !!requestedPages?.length);
+    if ("error" in opened) {
+      return NextResponse.json({ error: opened.error }, { status: 400 });
     }
 
-    const pdfBuffer = await response.arrayBuffer();
+    const { pdfDoc } = opened;
 
-    // Load the PDF document
-    const pdfDoc = await pdfjsLib.getDocument({
-      data: new Uint8Array(pdfBuffer),
-      useSystemFonts: true,
-    }).promise;
-
-    const totalPages = pdfDoc.numPages;
-
-    // Determine which pages to extract
-    const pagesToExtract = requestedPages?.length
-      ? requestedPages.filter((p) => p >= 1 && p <= totalPages)
-      : Array.from({ length: totalPages }, (_, i) => i + 1);
-
-    // Extract text data from requested pages
-    const pages: PageData[] = [];
-    for (const pageNum of pagesToExtract) {
-      const pageData = await extractPageData(pdfDoc, pageNum);
-      pages.push(pageData);
-    }
+    try {
+      const totalPages = pdfDoc.numPages;
+
+      // Determine which pages to extract
+      const pagesToExtract = requestedPages?.length
+        ? requestedPages.filter((p) => p >= 1 && p <= totalPages)
+        : Array.from({ length: totalPages }, (_, i) => i + 1);
 
-    await pdfDoc.destroy();
+      // Extract text data from requested pages
+      const pages = await extractPages(pdfDoc, pagesToExtract);
 
-    const result: ExtractResponse = {
-      pages,
-      totalPages,
-    };
+      const result: ExtractResponse = {
+        pages,
+        totalPages,
+      };
 
-    return NextResponse.json(result);
+      return NextResponse.json(result);
+    } finally {
+      await pdfDoc.destroy();
+    }
   } catch (error) {
     console.error("PDF text extraction error:", error);
     return NextResponse.json(
@@ -121,45 +110,43 @@ export async function GET(request: NextRequest) {
       );
     }
 
-    // Fetch the PDF
-    const response = await fetch(pdfUrl);
-    if (!response.ok) {
+    const pageNum = pageParam ? parseInt(pageParam, 10) : 1;
+
+    if (Number.isNaN(pageNum)) {
       return NextResponse.json(
-        { error: `Failed to fetch PDF: ${response.statusText}` },
+        { error: "Invalid page number" },
         { status: 400 },
       );
     }
 
-    const pdfBuffer = await response.arrayBuffer();
+    // Load the PDF document (only the ranges needed for one page)
+    const opened = await openRemotePdf(pdfUrl, true);
+    if ("error" in opened) {
+      return NextResponse.json({ error: opened.error }, { status: 400 });
+    }
 
-    // Load the PDF document
-    const pdfDoc = await pdfjsLib.getDocument({
-      data: new Uint8Array(pdfBuffer),
-      useSystemFonts: true,
-    }).promise;
+    const { pdfDoc } = opened;
 
-    const totalPages = pdfDoc.numPages;
-    const pageNum = pageParam ? parseInt(pageParam, 10) : 1;
+    try {
+      const totalPages = pdfDoc.numPages;
+
+      if (pageNum < 1 || pageNum > totalPages) {
+        return NextResponse.json(
+          { error: `Invalid page number. PDF has ${totalPages} pages.` },
+          { status: 400 },
+        );
+      }
 
-    if (pageNum < 1 || pageNum > totalPages) {
+      const stats = await extractPageStats(pdfDoc, pageNum);
+
+      return NextResponse.json({
+        pageNumber: pageNum,
+        totalPages,
+        ...stats,
+      });
+    } finally {
       await pdfDoc.destroy();
-      return NextResponse.json(
-        { error: `Invalid page number. PDF has ${totalPages} pages.` },
-        { status: 400 },
-      );
     }
-
-    const pageData = await extractPageData(pdfDoc, pageNum);
-    await pdfDoc.destroy();
-
-    return NextResponse.json({
-      pageNumber: pageNum,
-      totalPages,
-      hasText: pageData.hasText,
-      textItemCount: pageData.textItems.length,
-      width: pageData.width,
-      height: pageData.height,
-    });
   } catch (error) {
     console.error("PDF text check error:", error);
     return NextResponse.json(
@@ -170,3 +157,43 @@ export async function GET(request: NextRequest) {
     );
   }
 }
+
+/**
+ * Open a remote PDF. When only some pages are needed, pdf.js range-requests
+ * the bytes it uses; for the whole document one plain download is cheaper.
+ */
+async function openRemotePdf(
+  pdfUrl: string,
+  partial: boolean,
+): Promise<
+  | { pdfDoc: Awaited<ReturnType<typeof loadPdfDocument>> }
+  | { error: string }
+> {
+  if (partial) {
+    // pdf.js's Node transport does not follow redirects and only types 404s,
+    // so resolve the URL and surface HTTP errors with fetch first
+    const probe = await fetch(pdfUrl, { headers: { Range: "bytes=0-0" } });
+    await probe.body?.cancel();
+    if (!probe.ok) {
+      return { error: `Failed to fetch PDF: ${probe.statusText}` };
+    }
+
+    try {
+      return { pdfDoc: await loadPdfDocumentFromUrl(probe.url || pdfUrl) };
+    } catch (error) {
+      if (isPdfFetchError(error)) {
+        return { error: `Failed to fetch PDF: ${(error as Error).message}` };
+      }
+      throw error;
+    }
+  }
+
+  // Fetch the PDF
+  const response = await fetch(pdfUrl);
+  if (!response.ok) {
+    return { error: `Failed to fetch PDF: ${response.statusText}` };
+  }
+
+  const pdfBuffer = await response.arrayBuffer();
+  return { pdfDoc: await loadPdfDocument(new Uint8Array(pdfBuffer)) };
+}
@@ -18,6 +18,13 @@ const LANGUAGE_NAMES: Record<string, string> = {
   ar: "Arabic",
 };
 
+/**
+ * Static system prompt, kept byte-identical across requests so providers can
+ * reuse their prompt cache. Variable content goes at the end of the user turn.
+ */
+const TRANSLATION_SYSTEM_PROMPT = `You are a professional translator. Translate the given text accurately while preserving the meaning, tone, and technical terminology.
+Output ONLY the translated text, nothing else. No explanations, no quotes around the translation.`;
+
 /**
  * POST /api/translate
  * Translate text using LLM
@@ -39,9 +46,6 @@ export async function POST(request: NextRequest) {
       ? LANGUAGE_NAMES[sourceLanguage] || sourceLanguage
       : "auto-detected";
 
-    const systemPrompt = `You are a professional translator. Translate the given text accurately while preserving the meaning, tone, and technical terminology.
-Output ONLY the translated text, nothing else. No explanations, no quotes around the translation.`;
-
     const userPrompt = `Translate the following text from ${sourceLangName} to ${targetLangName}:
 
 ${text}`;
@@ -54,7 +58,7 @@ ${text}`;
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
           messages: [
-            { role: "system", content: systemPrompt },
+            { role: "system", content: TRANSLATION_SYSTEM_PROMPT },
             { role: "user", content: userPrompt },
           ],
           temperature: 0.3,
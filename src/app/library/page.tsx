@@ -91,6 +91,18 @@ export default function LibraryPage() {
         return Array.from(tagsSet).sort();
     }, [papers]);
 
+    // Lowercased title/authors/abstract per paper, built once per load so each
+    // keystroke is a single substring scan per paper. Fields are joined with
+    // "\n", which a search term from the input can never contain.
+    const searchIndex = useMemo(() => {
+        const index = new Map<string, string>();
+        papers.forEach((paper) => {
+            const fields = [paper.title, ...(paper.authors ?? []), paper.abstract];
+            index.set(paper.id, fields.filter(Boolean).join("\n").toLowerCase());
+        });
+        return index;
+    }, [papers]);
+
     // Filter and sort papers
     const filteredAndSortedPapers = useMemo(() => {
         let result = [...papers];
@@ -98,21 +110,17 @@ export default function LibraryPage() {
         // Filter by search term (title, authors, abstract)
         if (searchTerm.trim()) {
             const lowerSearch = searchTerm.toLowerCase();
-            result = result.filter((paper) => {
-                const titleMatch = paper.title?.toLowerCase().includes(lowerSearch);
-                const authorsMatch = paper.authors?.some((author) =>
-                    author.toLowerCase().includes(lowerSearch)
-                );
-                const abstractMatch = paper.abstract?.toLowerCase().includes(lowerSearch);
-                return titleMatch || authorsMatch || abstractMatch;
-            });
+            result = result.filter((paper) =>
+                searchIndex.get(paper.id)?.includes(lowerSearch)
+            );
         }
 
         // Filter by tags
         if (selectedTags.length > 0) {
             result = result.filter((paper) => {
                 if (!paper.tags || paper.tags.length === 0) return false;
-                return selectedTags.every((tag) => paper.tags!.includes(tag));
+                const paperTagSet = new Set(paper.tags);
+                return selectedTags.every((tag) => paperTagSet.has(tag));
             });
         }
 
@@ -139,7 +147,7 @@ export default function LibraryPage() {
         });
 
         return result;
-    }, [papers, searchTerm, selectedTags, selectedStatus, sortBy, sortOrder]);
+    }, [papers, searchIndex, searchTerm, selectedTags, selectedStatus, sortBy, sortOrder]);
 
     const handleToggleTag = (tag: string) => {
         setSelectedTags((prev) =>
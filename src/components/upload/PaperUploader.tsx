@@ -11,6 +11,10 @@ import {
   MAX_PDF_SIZE_LABEL,
 } from "@/lib/pdf/constants";
 
+const STATUS_POLL_INTERVAL_MS = 1000;
+/** Ingest route maxDuration (300s) plus a margin */
+const PROCESSING_TIMEOUT_MS = 6 * 60 * 1000;
+
 interface PaperUploaderProps {
   onUploadComplete?: (paperId: string) => void;
   onUploadError?: (error: string) => void;
@@ -105,6 +109,7 @@ export function PaperUploader({
 
       setProgress("Processing PDF...");
       const data = await response.json();
+      await waitForProcessing(data.paperId);
 
       setProgress(null);
       setFile(null);
@@ -227,3 +232,35 @@ export function PaperUploader({
     </div>
   );
 }
+
+/**
+ * Poll the ingest status endpoint until page extraction has finished
+ */
+async function waitForProcessing(paperId: string): Promise<void> {
+  const deadline = Date.now() + PROCESSING_TIMEOUT_MS;
+
+  while (true) {
+    const response = await fetch(
+      `/api/papers/ingest?paperId=${encodeURIComponent(paperId)}`,
+    );
+    const data = await response.json();
+
+    if (!response.ok) {
+      throw new Error(data.error || "Failed to check processing status");
+    }
+
+    if (data.status === "error") {
+      throw new Error(data.error || "Failed to process PDF");
+    }
+
+    if (data.status !== "processing") return;
+
+    if (Date.now() > deadline) {
+      throw new Error("PDF processing timed out");
+    }
+
+    await new Promise((resolve) =>
+      setTimeout(resolve, STATUS_POLL_INTERVAL_MS),
+    );
+  }
+}
@@ -112,25 +112,54 @@ When the user shares an image (figure, graph, table, equation):
 ## OUTPUT FORMAT
 Return plain text only. Do NOT return JSON. Do NOT include citation markers.`;
 
+/**
+ * Max paper context length (rough estimate: 4 chars per token, ~8000 tokens)
+ */
+export const MAX_CONTEXT_LENGTH = 32000;
+
+/**
+ * Max selected passage length, capped separately since it is appended after
+ * the page context is truncated
+ */
+export const MAX_HIGHLIGHT_LENGTH = 4000;
+
 /**
  * Build context from pages for LLM
+ *
+ * Page text comes first and the selected passage last, so the (large) paper
+ * context stays a byte-identical prefix across requests and can be served
+ * from the provider's prompt cache.
  */
 export function buildPageContext(
   pages: Array<{ pageNumber: number; textContent: string }>,
   highlightContext?: { page: number; text: string },
 ): string {
-  let context = "";
+  // Add page contents, stopping once the truncation limit is passed
+  const parts: string[] = [];
+  let length = 0;
+  for (const page of pages) {
+    const header = `\n[PAGE ${page.pageNumber}]\n`;
+    parts.push(header, page.textContent, "\n");
+    length += header.length + page.textContent.length + 1;
+    if (length > MAX_CONTEXT_LENGTH) break;
+  }
 
-  // Add highlight context if present
-  if (highlightContext) {
-    context += `\n[SELECTED PASSAGE - Page ${highlightContext.page}]\n`;
-    context += highlightContext.text + "\n\n";
+  let context = parts.join("");
+
+  if (context.length > MAX_CONTEXT_LENGTH) {
+    context =
+      context.slice(0, MAX_CONTEXT_LENGTH) + "\n[...context truncated...]";
   }
 
-  // Add page contents
-  for (const page of pages) {
-    context += `\n[PAGE ${page.pageNumber}]\n`;
-    context += page.textContent + "\n";
+  // Add highlight context if present (after page truncation, with its own cap)
+  if (highlightContext) {
+    const passage =
+      highlightContext.text.length > MAX_HIGHLIGHT_LENGTH
+        ? highlightContext.text.slice(0, MAX_HIGHLIGHT_LENGTH) +
+          "\n[...passage truncated...]"
+        : highlightContext.text;
+    context += `\n[SELECTED PASSAGE - Page ${highlightContext.page}]\n`;
+    context += passage + "\n\n";
   }
 
   return context;
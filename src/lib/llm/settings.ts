@@ -0,0 +1,43 @@
+import type { createClient } from "@/lib/supabase/server";
+
+type SupabaseServerClient = Awaited<ReturnType<typeof createClient>>;
+
+/**
+ * LLM routing settings stored in the `settings` table
+ */
+export interface LLMSettings {
+  llm_provider: string | null;
+  lmstudio_url: string | null;
+  openrouter_model: string | null;
+}
+
+/** How long a settings lookup is reused before hitting the database again */
+const SETTINGS_TTL_MS = 30 * 1000;
+
+let cachedSettings: { value: LLMSettings | null; expiresAt: number } | null =
+  null;
+
+/**
+ * Get LLM settings, cached in memory for SETTINGS_TTL_MS.
+ * The settings table holds a single app-wide row, so one entry is enough.
+ */
+export async function getLLMSettings(
+  supabase: SupabaseServerClient,
+): Promise<LLMSettings | null> {
+  const now = Date.now();
+  if (cachedSettings && cachedSettings.expiresAt > now) {
+    return cachedSettings.value;
+  }
+
+  const { data: settings } = await supabase
+    .from("settings")
+    .select("llm_provider, lmstudio_url, openrouter_model")
+    .single();
+
+  cachedSettings = {
+    value: (settings as LLMSettings | null) ?? null,
+    expiresAt: now + SETTINGS_TTL_MS,
+  };
+
+  return cachedSettings.value;
+}
@@ -0,0 +1,50 @@
+/**
+ * Read an OpenAI-compatible SSE chat completion stream and call `onDelta`
+ * for each content delta. Resolves when the stream ends or sends [DONE].
+ */
+export async function readCompletionDeltas(
+  body: ReadableStream<Uint8Array>,
+  onDelta: (delta: string) => void,
+): Promise<void> {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  try {
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) return;
+
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split("\n");
+      buffer = lines.pop() ?? "";
+
+      for (const line of lines) {
+        const trimmed = line.trim();
+        if (!trimmed.startsWith("data:")) continue;
+
+        const data = trimmed.replace(/^data:\s*/, "");
+        if (data === "[DONE]") return;
+
+        let delta: string;
+        try {
+          const parsed = JSON.parse(data);
+          delta =
+            parsed.choices?.[0]?.delta?.content ??
+            parsed.choices?.[0]?.message?.content ??
+            "";
+        } catch (parseError) {
+          console.error("Streaming parse error:", parseError);
+          continue;
+        }
+
+        // Outside the parse try: a failing onDelta (e.g. enqueue on a
+        // closed stream) ends the read and the finally cancels the reader
+        if (delta) onDelta(delta);
+      }
+    }
+  } finally {
+    // Stop the upstream body if we returned early on [DONE]
+    reader.cancel().catch(() => undefined);
+  }
+}
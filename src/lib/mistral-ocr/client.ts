@@ -4,6 +4,7 @@
  * Client for calling Mistral AI OCR API
  */
 
+import crypto from "crypto";
 import type { MistralOCRResponse, MistralOCRRequest } from "./types";
 
 const MISTRAL_API_URL = "https://api.mistral.ai/v1/ocr";
@@ -14,6 +15,12 @@ const MISTRAL_MODEL =
   process.env.mistral_model ||
   "mistral-ocr-2512";
 
+/**
+ * Images smaller than this (width and height, px) are not extracted: they are
+ * almost always glyph masks or decorations rather than figures
+ */
+const DEFAULT_IMAGE_MIN_SIZE = 100;
+
 /**
  * Process a document using Mistral OCR
  *
@@ -28,6 +35,13 @@ export async function processDocument(
     tableFormat?: "markdown" | "html";
     outputFormat?: "markdown" | "html";
     pages?: string;
+    /**
+     * Drop repeated image payloads (logos, headers) after their first use.
+     * Off by default: later copies then need `duplicate_of` to be rendered.
+     */
+    dedupeImages?: boolean;
+    /** Minimum image width/height in px to extract */
+    imageMinSize?: number;
   } = {},
 ): Promise<MistralOCRResponse> {
   if (!MISTRAL_API_KEY) {
@@ -41,6 +55,7 @@ export async function processDocument(
       document_url: documentUrl,
     },
     include_image_base64: options.includeImages ?? true,
+    image_min_size: options.imageMinSize ?? DEFAULT_IMAGE_MIN_SIZE,
     table_format: options.tableFormat ?? "markdown",
     output_format: options.outputFormat,
   };
@@ -63,7 +78,41 @@ export async function processDocument(
     throw new Error(`Mistral OCR failed: ${response.status} - ${errorText}`);
   }
 
-  return response.json();
+  const result: MistralOCRResponse = await response.json();
+
+  if (options.dedupeImages) {
+    dedupeImages(result);
+  }
+
+  return result;
+}
+
+/**
+ * Keep only the first copy of each identical image payload across pages.
+ * Later copies keep their bounding box and reference the first copy's page
+ * index and image id.
+ */
+function dedupeImages(result: MistralOCRResponse): void {
+  const seen = new Map<string, { page_index: number; id: string }>();
+
+  for (const page of result.pages) {
+    for (const image of page.images) {
+      if (!image.image_base64) continue;
+
+      const hash = crypto
+        .createHash("sha1")
+        .update(image.image_base64)
+        .digest("hex");
+      const first = seen.get(hash);
+
+      if (first === undefined) {
+        seen.set(hash, { page_index: page.index, id: image.id });
+      } else {
+        delete image.image_base64;
+        image.duplicate_of = first;
+      }
+    }
+  }
 }
 
 /**
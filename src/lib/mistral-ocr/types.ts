@@ -14,6 +14,11 @@ export interface MistralImage {
   bottom_right_x: number;
   bottom_right_y: number;
   image_base64?: string;
+  /**
+   * Set locally (not by the API) when image_base64 was dropped because an
+   * identical image appears earlier in the document; locates that image
+   */
+  duplicate_of?: { page_index: number; id: string };
 }
 
 /**
@@ -11,11 +11,77 @@ interface PDFTextItem {
   fontName: string;
 }
 
+/** Minimum trimmed text length for a page to count as having text */
+const MIN_PAGE_TEXT_LENGTH = 50;
+
 pdfjsLib.GlobalWorkerOptions.workerSrc = new URL(
   "pdfjs-dist/legacy/build/pdf.worker.mjs",
   import.meta.url,
 ).toString();
 
+/**
+ * One pdf.js worker per server process, created on first use and shared by
+ * every document instead of being set up (and torn down) per request.
+ */
+let sharedWorker: pdfjsLib.PDFWorker | null = null;
+
+function getSharedWorker(): pdfjsLib.PDFWorker {
+  if (!sharedWorker || sharedWorker.destroyed) {
+    const worker = new pdfjsLib.PDFWorker();
+    // A failed setup must not be reused: drop it so the next call retries
+    worker.promise.catch((error: unknown) => {
+      console.error("pdf.js worker setup failed:", error);
+      if (sharedWorker === worker) sharedWorker = null;
+      worker.destroy();
+    });
+    sharedWorker = worker;
+  }
+  return sharedWorker;
+}
+
+/**
+ * Open a PDF document on the shared worker.
+ * Callers must destroy() the returned document; the worker stays alive.
+ */
+export async function loadPdfDocument(
+  data: Uint8Array,
+): Promise<pdfjsLib.PDFDocumentProxy> {
+  return pdfjsLib.getDocument({
+    data,
+    useSystemFonts: true,
+    worker: getSharedWorker(),
+  }).promise;
+}
+
+/**
+ * Open a remote PDF with HTTP range requests: pdf.js fetches only the byte
+ * ranges it needs (xref, requested pages) instead of the whole file, and
+ * falls back to a full download when the server does not support ranges.
+ */
+export async function loadPdfDocumentFromUrl(
+  url: string,
+): Promise<pdfjsLib.PDFDocumentProxy> {
+  return pdfjsLib.getDocument({
+    url,
+    useSystemFonts: true,
+    worker: getSharedWorker(),
+    disableStream: true,
+    disableAutoFetch: true,
+  }).promise;
+}
+
+/**
+ * Whether a pdf.js load error means the PDF could not be retrieved
+ * (as opposed to a retrieved file that failed to parse)
+ */
+export function isPdfFetchError(error: unknown): boolean {
+  return (
+    error instanceof Error &&
+    (error.name === "MissingPDFException" ||
+      error.name === "UnexpectedResponseException")
+  );
+}
+
 /**
  * Extract text data from a single PDF page
  * Coordinates are normalized to 0-1 for viewport-independent rendering
@@ -30,7 +96,8 @@ export async function extractPageData(
 
   let currentOffset = 0;
   const textItems: TextItem[] = [];
-  let fullText = "";
+  // Collected and joined once at the end instead of repeated concatenation
+  const textParts: string[] = [];
 
   for (const item of textContent.items) {
     // Type guard for text items (vs marked content)
@@ -49,7 +116,7 @@ export async function extractPageData(
     const height = (pdfItem.height || 0) / viewport.height;
 
     const startOffset = currentOffset;
-    fullText += str;
+    textParts.push(str);
     currentOffset += str.length;
     const endOffset = currentOffset;
 
@@ -65,44 +132,165 @@ export async function extractPageData(
 
     // Add space between items if the text doesn't end with whitespace
     if (!str.endsWith(" ") && !str.endsWith("\n")) {
-      fullText += " ";
+      textParts.push(" ");
       currentOffset += 1;
     }
   }
 
+  const fullText = textParts.join("");
+
   return {
     pageNumber: pageNum,
     textContent: fullText.trim(),
     textItems,
     width: viewport.width,
     height: viewport.height,
-    hasText: textItems.length > 0 && fullText.trim().length > 50,
+    hasText:
+      textItems.length > 0 && fullText.trim().length > MIN_PAGE_TEXT_LENGTH,
   };
 }
 
 /**
- * Extract all pages from a PDF buffer
+ * Single pass over a page's text items for the text-presence check only.
+ * Matches extractPageData's hasText without building TextItems or offsets.
  */
-export async function extractAllPages(
-  pdfBuffer: ArrayBuffer,
-): Promise<PageData[]> {
-  const pdfDoc = await pdfjsLib.getDocument({
-    data: new Uint8Array(pdfBuffer),
-    useSystemFonts: true,
-  }).promise;
+export async function extractPageStats(
+  pdfDoc: pdfjsLib.PDFDocumentProxy,
+  pageNum: number,
+): Promise<{
+  textItemCount: number;
+  hasText: boolean;
+  width: number;
+  height: number;
+}> {
+  const page = await pdfDoc.getPage(pageNum);
+  const viewport = page.getViewport({ scale: 1.0 });
+  const textContent = await page.getTextContent();
 
-  const pages: PageData[] = [];
+  let textItemCount = 0;
+  // Length and first/last non-whitespace offsets of the text extractPageData
+  // would build, so its trimmed length is known without concatenating it
+  let textLength = 0;
+  let firstNonSpace = -1;
+  let lastNonSpace = -1;
+
+  for (const item of textContent.items) {
+    if (!("str" in item)) continue;
+
+    const str = (item as PDFTextItem).str;
+    if (!str) continue;
+
+    textItemCount++;
 
-  for (let i = 1; i <= pdfDoc.numPages; i++) {
-    const pageData = await extractPageData(pdfDoc, i);
-    pages.push(pageData);
+    const leading = str.search(/\S/);
+    if (leading !== -1) {
+      if (firstNonSpace === -1) firstNonSpace = textLength + leading;
+      lastNonSpace = textLength + str.search(/\s*$/) - 1;
+    }
+
+    textLength += str.length;
+    if (!str.endsWith(" ") && !str.endsWith("\n")) {
+      textLength += 1;
+    }
   }
 
-  await pdfDoc.destroy();
+  const trimmedLength =
+    firstNonSpace === -1 ? 0 : lastNonSpace - firstNonSpace + 1;
+
+  return {
+    textItemCount,
+    hasText: textItemCount > 0 && trimmedLength > MIN_PAGE_TEXT_LENGTH,
+    width: viewport.width,
+    height: viewport.height,
+  };
+}
+
+/**
+ * Extract several pages, returned in the order requested
+ *
+ * Pages are parsed one at a time: on Node, pdf.js runs its "fake worker" on
+ * the main thread, so overlapping getTextContent calls would only interleave
+ * on that thread and raise peak memory without any speedup.
+ */
+export async function extractPages(
+  pdfDoc: pdfjsLib.PDFDocumentProxy,
+  pageNumbers: number[],
+): Promise<PageData[]> {
+  const pages: PageData[] = [];
+
+  for (const pageNum of pageNumbers) {
+    pages.push(await extractPageData(pdfDoc, pageNum));
+  }
 
   return pages;
 }
 
+/**
+ * Info titles written by authoring tools rather than authors
+ */
+const PLACEHOLDER_TITLE_PATTERNS = [
+  /^untitled\b/i,
+  /^microsoft (word|powerpoint|excel) - /i,
+  /\.(pdf|docx?|pptx?|odt|rtf|tex|dvi|ps)$/i,
+];
+
+/**
+ * Read the title from the PDF Info dictionary.
+ * Only document metadata is parsed, never page content. Blank and
+ * tool-generated placeholder titles are ignored.
+ */
+export async function getDocumentTitle(
+  pdfDoc: pdfjsLib.PDFDocumentProxy,
+): Promise<string | null> {
+  const { info } = await pdfDoc.getMetadata();
+  const rawTitle = (info as { Title?: unknown }).Title;
+  const title = typeof rawTitle === "string" ? rawTitle.trim() : "";
+
+  if (!title || PLACEHOLDER_TITLE_PATTERNS.some((re) => re.test(title))) {
+    return null;
+  }
+
+  return title;
+}
+
+/**
+ * Read only the metadata title from a PDF buffer (no page is extracted)
+ */
+export async function readDocumentTitle(
+  pdfBuffer: ArrayBuffer,
+): Promise<string | null> {
+  const pdfDoc = await loadPdfDocument(new Uint8Array(pdfBuffer));
+
+  try {
+    return await getDocumentTitle(pdfDoc);
+  } finally {
+    await pdfDoc.destroy();
+  }
+}
+
+/**
+ * Extract all pages and the metadata title from a PDF buffer
+ */
+export async function extractDocument(
+  pdfBuffer: ArrayBuffer,
+): Promise<{ title: string | null; pages: PageData[] }> {
+  const pdfDoc = await loadPdfDocument(new Uint8Array(pdfBuffer));
+
+  try {
+    const pageNumbers = Array.from(
+      { length: pdfDoc.numPages },
+      (_, i) => i + 1,
+    );
+    const [title, pages] = await Promise.all([
+      getDocumentTitle(pdfDoc),
+      extractPages(pdfDoc, pageNumbers),
+    ]);
+    return { title, pages };
+  } finally {
+    await pdfDoc.destroy();
+  }
+}
+
 /**
  * Chunk page content into smaller pieces for RAG
  */